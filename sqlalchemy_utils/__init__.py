@@ -98,7 +98,8 @@ from .types import (  # noqa
 from .view import (  # noqa
     create_materialized_view,
     create_view,
-    refresh_materialized_view
+    refresh_materialized_view,
+    refresh_materialized_views
 )
 
 __version__ = '0.41.1'
@@ -1,26 +1,43 @@
+from itertools import chain
+
 import sqlalchemy as sa
 from sqlalchemy import inspection
 from sqlalchemy.ext import compiler
 from sqlalchemy.sql.base import DialectKWArgs
-from sqlalchemy.schema import DDLElement, PrimaryKeyConstraint
+from sqlalchemy.schema import DDLElement
 from sqlalchemy.sql.expression import ClauseElement, Executable
 from sqlalchemy.sql.schema import _CreateDropBind, HasSchemaAttr, Table, _get_table_key
 from sqlalchemy.sql.ddl import _CreateBase, _DropBase, SchemaGenerator, SchemaDropper
+from sqlalchemy.sql.visitors import InternalTraversal
 
 from sqlalchemy_utils.functions import get_columns
 
-class View(Table, inspection.Inspectable["View"]):
-    __visit_name__ = "table"  # Behave as table when not used for create/drop view
+# Key in ``MetaData.info`` under which the views created on it are recorded.
+_VIEWS_INFO_KEY = '_sqlalchemy_utils_views'
 
-    def __init__(self,  name, metadata, selectable, materialized=False, replace=False, *args, **kwargs):
+
+class View(Table, inspection.Inspectable["View"]):
+    def __init__(
+        self,
+        name,
+        metadata,
+        selectable,
+        materialized=False,
+        replace=False,
+        *args,
+        cascade=True,
+        **kwargs
+    ):
         super().__init__(name, metadata, *args, **kwargs)
         if materialized and replace:
             raise ValueError("Cannot use CREATE OR REPLACE with materialized views")
         self._selectable = selectable
         self._materialized = materialized
         self._replace = replace
+        self._cascade = cascade
+        self._compiled_ddl_cache = {}
+        self._update_ddl_prefixes()
 
-    
     @property
     def selectable(self):
         return self._selectable
@@ -28,6 +45,7 @@ class View(Table, inspection.Inspectable["View"]):
     @selectable.setter
     def selectable(self, value):
         self._selectable = value
+        self._compiled_ddl_cache.clear()
 
     @property
     def materialized(self):
@@ -36,6 +54,7 @@ class View(Table, inspection.Inspectable["View"]):
     @materialized.setter
     def materialized(self, value):
         self._materialized = value
+        self._update_ddl_prefixes()
 
     @property
     def replace(self):
@@ -44,6 +63,35 @@ class View(Table, inspection.Inspectable["View"]):
     @replace.setter
     def replace(self, value):
         self._replace = value
+        self._update_ddl_prefixes()
+
+    @property
+    def cascade(self):
+        return self._cascade
+
+    @cascade.setter
+    def cascade(self, value):
+        self._cascade = value
+        self._update_ddl_prefixes()
+
+    def _update_ddl_prefixes(self):
+        # The statement fragments only depend on the view options, so render
+        # them up front and drop any DDL compiled with the previous options.
+        # ``dialect_options`` are only read here: changing them after the
+        # view is constructed has no effect on the emitted DDL.
+        self._compiled_ddl_cache.clear()
+        materialized = 'MATERIALIZED ' if self._materialized else ''
+        replace = 'OR REPLACE ' if self._replace else ''
+        self._create_prefix = f'CREATE {replace}{materialized}VIEW '
+        self._drop_prefix = f'DROP {materialized}VIEW IF EXISTS '
+        self._drop_suffix = ' CASCADE' if self._cascade else ''
+        withclause = self.dialect_options.get("postgresql", {}).get("with", {})
+        self._withclause_text = ''
+        if withclause:
+            storage_parameters = ", ".join(
+                f"{param} = {value}" for param, value in withclause.items()
+            )
+            self._withclause_text = f" WITH ({storage_parameters})"
 
     def create_view(self, bind: _CreateDropBind, checkfirst: bool = False) -> None:
         """Issue a ``CREATE`` statement for this
@@ -55,11 +103,9 @@ class View(Table, inspection.Inspectable["View"]):
             :meth:`_schema.MetaData.create_all`.
 
         """
-        View.__visit_name__ = 'view'
-        try:
-            bind._run_ddl_visitor(ExtSchemaGenerator, self, checkfirst=checkfirst)
-        finally:
-            View.__visit_name__ = 'table'
+        bind._run_ddl_visitor(
+            ExtSchemaGenerator, CreateView(self), checkfirst=checkfirst
+        )
 
     def drop_view(self, bind: _CreateDropBind, checkfirst: bool = False) -> None:
         """Issue a ``DROP`` statement for this
@@ -71,18 +117,17 @@ class View(Table, inspection.Inspectable["View"]):
             :meth:`_schema.MetaData.drop_all`.
 
         """
-        View.__visit_name__ = 'view'
-        try:
-            bind._run_ddl_visitor(ExtSchemaDropper, self, checkfirst=checkfirst)
-        finally:
-            View.__visit_name__ = 'table'
+        bind._run_ddl_visitor(
+            ExtSchemaDropper, DropView(self), checkfirst=checkfirst
+        )
 
     def __repr__(self) -> str:
         return "View(%s)" % ", ".join(
-            [repr(self.name)]
-            + [repr(self.metadata)]
-            + [repr(x) for x in self.columns]
-            + ["%s=%s" % (k, repr(getattr(self, k))) for k in ["schema"]]
+            chain(
+                (repr(self.name), repr(self.metadata)),
+                (repr(x) for x in self.columns),
+                (f"{k}={getattr(self, k)!r}" for k in ("schema",)),
+            )
         )
 
     def __str__(self) -> str:
@@ -92,6 +137,7 @@ class CreateView(_CreateBase):
     """Represent a CREATE VIEW statement."""
 
     __visit_name__ = "create_view"
+    inherit_cache = True
 
     def __init__(self, element, if_not_exists=False):
         """Create a :class:`.CreateView` construct.
@@ -111,6 +157,7 @@ class DropView(_DropBase):
     """Represent a DROP VIEW statement."""
 
     __visit_name__ = "drop_view"
+    inherit_cache = True
 
     def __init__(self, element, if_exists=False):
         """Create a :class:`.DropView` construct.
@@ -127,47 +174,65 @@ class DropView(_DropBase):
 
 
 class ExtSchemaGenerator(SchemaGenerator):
-    def visit_view(self, view, create_ok=False):
-        with self.with_ddl_events(view):
-            CreateView(view)._invoke_with(self.connection)
+    def visit_create_view(self, create, create_ok=False):
+        with self.with_ddl_events(create.element):
+            create._invoke_with(self.connection)
 
 class ExtSchemaDropper(SchemaDropper):
-    def visit_view(self, view, drop_ok=False):
-        with self.with_ddl_events(view):
-            DropView(view)(view, self.connection)
+    def visit_drop_view(self, drop, drop_ok=False):
+        with self.with_ddl_events(drop.element):
+            drop._invoke_with(self.connection)
+
+
+def _compiled_ddl_key(kind, compiler, kw):
+    # The rendered selectable depends on the compile context as well as on the
+    # dialect, e.g. a schema_translate_map emits schema tokens. Returns None
+    # when that context cannot be hashed, in which case nothing is cached.
+    schema_translate_map = getattr(compiler, 'schema_translate_map', None)
+    key = (
+        kind,
+        compiler.dialect.name,
+        tuple(schema_translate_map.items()) if schema_translate_map else None,
+        tuple(sorted(kw.items())),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
 
 
 @compiler.compiles(CreateView)
 def compile_create_materialized_view(create, compiler, **kw):
     element = create.element
-    withclause = element.dialect_options.get("postgresql", {}).get("with", {})
-    withclause_text = ''
-    if withclause:
-        withclause_text += " WITH (%s)" % (
-            ", ".join(
-                [
-                    "%s = %s" % storage_parameter
-                    for storage_parameter in withclause.items()
-                ]
-            )
-        )
-    return 'CREATE {}{}VIEW {}{} AS {}'.format(
-        'OR REPLACE ' if element.replace else '',
-        'MATERIALIZED ' if element.materialized else '',
-        compiler.dialect.identifier_preparer.quote(element.name),
-        withclause_text,
-        compiler.sql_compiler.process(element.selectable, literal_binds=True),
+    key = _compiled_ddl_key('create', compiler, kw)
+    ddl = element._compiled_ddl_cache.get(key)
+    if ddl is not None:
+        return ddl
+    name = compiler.dialect.identifier_preparer.quote(element.name)
+    selectable = compiler.sql_compiler.process(
+        element.selectable, literal_binds=True
+    )
+    ddl = (
+        f'{element._create_prefix}{name}{element._withclause_text} AS {selectable}'
     )
+    if key is not None:
+        element._compiled_ddl_cache[key] = ddl
+    return ddl
 
 
 @compiler.compiles(DropView)
 def compile_drop_materialized_view(create, compiler, **kw):
     element = create.element
-    return 'DROP {}VIEW IF EXISTS {} {}'.format(
-        'MATERIALIZED ' if element.materialized else '',
-        compiler.dialect.identifier_preparer.quote(element.name),
-        'CASCADE' if element.cascade else ''
-    )
+    key = _compiled_ddl_key('drop', compiler, kw)
+    ddl = element._compiled_ddl_cache.get(key)
+    if ddl is not None:
+        return ddl
+    name = compiler.dialect.identifier_preparer.quote(element.name)
+    ddl = f'{element._drop_prefix}{name}{element._drop_suffix}'
+    if key is not None:
+        element._compiled_ddl_cache[key] = ddl
+    return ddl
 
 
 def create_view_from_selectable(
@@ -178,30 +243,63 @@ def create_view_from_selectable(
     aliases=None,
     materialized=False,
     replace=False,
+    cascade_on_drop=True,
     **kwargs
 ):
     if indexes is None:
         indexes = []
     if metadata is None:
+        # A private MetaData per view: a shared one would reject a second view
+        # with the same name and keep every anonymous view alive forever.
         metadata = sa.MetaData()
     if aliases is None:
         aliases = {}
+    columns = list(get_columns(selectable))
+    # Without an explicit primary key, every column becomes part of it.
+    all_primary_key = not any(c.primary_key for c in columns)
     args = [
         sa.Column(
             c.name,
             c.type,
             key=aliases.get(c.name, c.name),
-            primary_key=c.primary_key
+            primary_key=all_primary_key or c.primary_key
         )
-        for c in get_columns(selectable)
+        for c in columns
     ] + indexes
-    view = View(name, metadata, selectable, materialized, replace, *args, **kwargs)
+    return View(
+        name,
+        metadata,
+        selectable,
+        materialized,
+        replace,
+        *args,
+        cascade=cascade_on_drop,
+        **kwargs
+    )
 
-    if not any([c.primary_key for c in get_columns(selectable)]):
-        view.append_constraint(
-            PrimaryKeyConstraint(*[c.name for c in get_columns(selectable)])
-        )
-    return view
+
+def _create_metadata_views(target, connection, **kw):
+    for view in target.info.get(_VIEWS_INFO_KEY, ()):
+        view.create_view(connection)
+        for idx in view.indexes:
+            idx.create(connection)
+
+
+def _drop_metadata_views(target, connection, **kw):
+    for view in target.info.get(_VIEWS_INFO_KEY, ()):
+        view.drop_view(connection)
+
+
+def _attach_view_listeners(view, metadata):
+    # The registry lives on the metadata and holds a strong reference to the
+    # view: the metadata owns views created through it, even when the caller
+    # discards the returned object (as in the ``create_view`` example).
+    views = metadata.info.get(_VIEWS_INFO_KEY)
+    if views is None:
+        views = metadata.info[_VIEWS_INFO_KEY] = []
+        sa.event.listen(metadata, 'after_create', _create_metadata_views)
+        sa.event.listen(metadata, 'before_drop', _drop_metadata_views)
+    views.append(view)
 
 
 def create_materialized_view(
@@ -238,20 +336,7 @@ def create_materialized_view(
         replace=False,
         **kwargs
     )
-
-    @sa.event.listens_for(metadata, 'after_create')
-    def create_view(target, connection, **kw):
-        view.create_view(connection)
-
-    @sa.event.listens_for(metadata, 'after_create')
-    def create_indexes(target, connection, **kw):
-        for idx in view.indexes:
-            idx.create(connection)
-
-    @sa.event.listens_for(metadata, 'before_drop')
-    def drop_view(target, connection, **kw):
-        view.drop_view(connection)
-
+    _attach_view_listeners(view, metadata)
     return view
 
 
@@ -304,28 +389,25 @@ def create_view(
         selectable=selectable,
         metadata=None,
         replace=replace,
+        cascade_on_drop=cascade_on_drop,
         **kwargs
     )
-
-    @sa.event.listens_for(metadata, 'after_create')
-    def create_view(target, connection, **kw):
-        view.create_view(connection)
-
-    @sa.event.listens_for(metadata, 'after_create')
-    def create_indexes(target, connection, **kw):
-        for idx in view.indexes:
-            idx.create(connection)
-
-    @sa.event.listens_for(metadata, 'before_drop')
-    def drop_view(target, connection, **kw):
-        view.drop_view(connection)
-
+    _attach_view_listeners(view, metadata)
     return view
 
 
 class RefreshMaterializedView(Executable, ClauseElement):
-    inherit_cache = True
-
+    # The view name is rendered into the compiled string, so it must be part
+    # of the cache key; otherwise refreshes of different views would share
+    # the same cached statement.
+    _cache_key_traversal = [
+        ('name', InternalTraversal.dp_string),
+        ('concurrently', InternalTraversal.dp_boolean),
+    ]
+
+    # Not slotted: ClauseElement instances already carry a __dict__, so
+    # __slots__ would save nothing, and ClauseElement._clone() copies state
+    # through __dict__, which slotted attributes would bypass.
     def __init__(self, name, concurrently):
         self.name = name
         self.concurrently = concurrently
@@ -333,10 +415,10 @@ class RefreshMaterializedView(Executable, ClauseElement):
 
 @compiler.compiles(RefreshMaterializedView)
 def compile_refresh_materialized_view(element, compiler):
-    return 'REFRESH MATERIALIZED VIEW {concurrently}{name}'.format(
-        concurrently='CONCURRENTLY ' if element.concurrently else '',
-        name=compiler.dialect.identifier_preparer.quote(element.name),
-    )
+    name = compiler.dialect.identifier_preparer.quote(element.name)
+    if element.concurrently:
+        return 'REFRESH MATERIALIZED VIEW CONCURRENTLY ' + name
+    return 'REFRESH MATERIALIZED VIEW ' + name
 
 
 def refresh_materialized_view(session, name, concurrently=False):
@@ -349,6 +431,24 @@ def refresh_materialized_view(session, name, concurrently=False):
         to be specified when the materialized view is refreshed.
     """
     # Since session.execute() bypasses autoflush, we must manually flush in
-    # order to include newly-created/modified objects in the refresh.
+    # order to include newly-created/modified objects in the refresh. The
+    # flush returns immediately when the session has no pending changes.
     session.flush()
     session.execute(RefreshMaterializedView(name, concurrently))
+
+
+def refresh_materialized_views(session, names, concurrently=False):
+    """ Refreshes several already existing materialized views
+
+    Same as calling ``refresh_materialized_view`` for each name, except that
+    the session is flushed only once before the views are refreshed.
+
+    :param session: An SQLAlchemy Session instance.
+    :param names: An iterable of materialized view names to refresh.
+    :param concurrently:
+        Optional flag that causes the ``CONCURRENTLY`` parameter
+        to be specified when the materialized views are refreshed.
+    """
+    session.flush()
+    for name in names:
+        session.execute(RefreshMaterializedView(name, concurrently))
@@ -1,14 +1,19 @@
+import gc
+import weakref
+
 import pytest
 import sqlalchemy as sa
 import sqlalchemy.orm
+from sqlalchemy.dialects import postgresql
 
 from sqlalchemy_utils import (
     create_materialized_view,
     create_view,
-    refresh_materialized_view
+    refresh_materialized_view,
+    refresh_materialized_views
 )
 from sqlalchemy_utils.compat import _select_args
-from sqlalchemy_utils.view import CreateView
+from sqlalchemy_utils.view import CreateView, DropView, RefreshMaterializedView
 
 
 @pytest.fixture
@@ -53,6 +58,17 @@ def ArticleMV(Base, Article, User):
     return ArticleMV
 
 
+@pytest.fixture
+def UserMV(Base, User):
+    class UserMV(Base):
+        __table__ = create_materialized_view(
+            name='user-mv',
+            selectable=sa.select(*_select_args(User.id, User.name)),
+            metadata=Base.metadata
+        )
+    return UserMV
+
+
 @pytest.fixture
 def ArticleView(Base, Article, User):
     class ArticleView(Base):
@@ -98,6 +114,20 @@ class TestMaterializedViews:
         assert materialized.article_name == 'Some article'
         assert materialized.author_name == 'Some user'
 
+    def test_refresh_materialized_views(
+        self,
+        session,
+        Article,
+        User,
+        ArticleMV,
+        UserMV
+    ):
+        session.add(Article(name='Some article', author=User(name='Some user')))
+        session.commit()
+        refresh_materialized_views(session, ['article-mv', 'user-mv'])
+        assert session.query(ArticleMV).one().article_name == 'Some article'
+        assert session.query(UserMV).one().name == 'Some user'
+
     def test_querying_view(
         self,
         session,
@@ -234,3 +264,113 @@ class TestMySqlTrivialView(SupportsCascade, SupportsNoCascade, SupportsReplace):
 @pytest.mark.usefixtures('sqlite_none_database_dsn')
 class TestSqliteTrivialView(DoesntSupportCascade, SupportsNoCascade):
     pass
+
+
+class TestRefreshMaterializedViewCacheKey:
+    def test_same_arguments_share_cache_key(self):
+        assert (
+            RefreshMaterializedView('article-mv', False)._generate_cache_key()
+            == RefreshMaterializedView('article-mv', False)._generate_cache_key()
+        )
+
+    @pytest.mark.parametrize(
+        'other',
+        [('user-mv', False), ('article-mv', True)]
+    )
+    def test_different_arguments_have_different_cache_keys(self, other):
+        assert (
+            RefreshMaterializedView('article-mv', False)._generate_cache_key()
+            != RefreshMaterializedView(*other)._generate_cache_key()
+        )
+
+
+class TestViewRegistry:
+    def test_metadata_is_collectable(self):
+        metadata = sa.MetaData()
+        table = sa.Table(
+            'user',
+            metadata,
+            sa.Column('id', sa.Integer, primary_key=True)
+        )
+        create_view(
+            name='user_view',
+            selectable=sa.select(*_select_args(table.c.id)),
+            metadata=metadata
+        )
+        metadata_ref = weakref.ref(metadata)
+        del metadata, table
+        gc.collect()
+        assert metadata_ref() is None
+
+
+class TestViewDDLCompilation:
+    @pytest.fixture
+    def users(self):
+        return sa.Table(
+            'user',
+            sa.MetaData(),
+            sa.Column('id', sa.Integer, primary_key=True)
+        )
+
+    @pytest.fixture
+    def view(self, users):
+        return create_view(
+            name='user_view',
+            selectable=sa.select(*_select_args(users.c.id)),
+            metadata=sa.MetaData()
+        )
+
+    def compile(self, construct, **kwargs):
+        return str(construct.compile(dialect=postgresql.dialect(), **kwargs))
+
+    @pytest.mark.parametrize('compile_plain_first', [True, False])
+    def test_create_view_honors_schema_translate_map(
+        self,
+        view,
+        compile_plain_first
+    ):
+        def compile_plain():
+            return self.compile(CreateView(view))
+
+        def compile_translated():
+            return self.compile(
+                CreateView(view),
+                schema_translate_map={None: 'tenant_a'},
+                render_schema_translate=True
+            )
+
+        if compile_plain_first:
+            plain = compile_plain()
+            translated = compile_translated()
+        else:
+            translated = compile_translated()
+            plain = compile_plain()
+        assert 'FROM "user"' in plain
+        assert '__[SCHEMA' not in plain
+        assert 'FROM tenant_a."user"' in translated
+
+    @pytest.mark.parametrize(
+        ('create', 'cascade_on_drop', 'expected'),
+        [
+            (create_view, True, 'DROP VIEW IF EXISTS user_view CASCADE'),
+            (create_view, False, 'DROP VIEW IF EXISTS user_view'),
+            (
+                create_materialized_view,
+                True,
+                'DROP MATERIALIZED VIEW IF EXISTS user_view CASCADE'
+            ),
+            (
+                create_materialized_view,
+                False,
+                'DROP MATERIALIZED VIEW IF EXISTS user_view'
+            ),
+        ]
+    )
+    def test_drop_view_cascade(self, users, create, cascade_on_drop, expected):
+        view = create(
+            name='user_view',
+            selectable=sa.select(*_select_args(users.c.id)),
+            metadata=sa.MetaData(),
+            cascade_on_drop=cascade_on_drop
+        )
+        assert self.compile(DropView(view)) == expected